@@ -1,78 +1,251 @@
 from tkinter import *
+import queue
 import random
+import threading
 
-class CheckerSquare(Canvas):
-    '''represents a square on a checkerboard'''
-
-    def __init__(self,master,r,c,color):
-        '''CheckerSquare(master,r,c,color) -> CheckerSquare
-        creates a new empty checkers square
-        (r,c) is the row,column coordinates of the square
-        color is the background color'''
-        super().__init__(master,width=50,height=50,highlightbackground=color,\
-                        highlightcolor='black',bg=color)
-        self.grid(row=r,column=c,ipadx=0,ipady=0,padx=0,pady=0)
-        # set the coorindates
-        self.row = r
-        self.column = c
-        # allow the squares being used to be clicked upon
-        if (r+c) % 2 == 1:  # only squares whose coords sum to an odd number are used
-            self.bind('<Button>',master.on_click)
-        self.player = None   # stores which player's piece is on the square
-        self.isKing = False  # stores whether a king is on the square
-
-    def get_pos(self):
-        '''CheckerSquare.get_pos() -> (int,int)
-        returns the coordinates of the square'''
-        return (self.row,self.column)
-
-    def get_player(self):
-        '''CheckerSquare.get_player() -> int/None
-        returns the number of the player whose piece is on the square
-        (None if the square is empty)'''
-        return self.player
-
-    def is_king(self):
-        '''CheckerSquare.is_king() -> bool
-        returns True if a king is on the square, False otherwise'''
-        return self.isKing
-
-    def is_empty(self):
-        '''CheckerSquare.is_empty() -> bool
-        returns True is the square is empty, False if it contains a piece'''
-        return not isinstance(self.player,int)
-
-    def clear_checker(self):
-        '''CheckerSquare.clear_checker()
-        removes a piece (if any) from the square'''
-        self.player = None
-        # clear all canvas items
-        objectList = self.find_all()
-        for obj in objectList:
-            self.delete(obj)
-
-    def set_checker(self,player,color,isKing):
-        '''CheckerSquare.set_checker(player,color,isKing)
-        places a piece on the square
-        player is the player number
-        color is the player color
-        isKing is True if the piece is a king, False if a normal piece'''
-        # clear old checker (if any)
-        self.clear_checker()
-        # set attributes
-        self.player = player
-        self.isKing = isKing
-        # draw new checker
-        self.create_oval(10,10,44,44,fill=color)
-        # draw king if necessary
-        if isKing:
-            self.create_text(27,35,text='*',font=('Arial',30))
+# game colors
+BOARD_COLORS = ('blanched almond','dark green')
+COLORS = ('red','white')
+DIRECTION = (-1,1)  # the directions of "forward" motion
+
+def make_jump_table():
+    '''make_jump_table() -> dict
+    precomputes the squares a piece can jump to
+    the table is keyed by (player,isKing,row,column) and lists
+      (jumpedRow,jumpedCol,landRow,landCol) for each jump
+    only jumps that land on the board are included'''
+    jumpTable = {}
+    for player in range(2):
+        for isKing in range(2):
+            # forward directions, then backwards directions for a king
+            rowSteps = [DIRECTION[player]]
+            if isKing:
+                rowSteps.append(-DIRECTION[player])
+            for row in range(8):
+                for col in range(8):
+                    jumps = []
+                    for dr in rowSteps:
+                        for dc in (1,-1):
+                            if (0 <= row + 2*dr < 8) and (0 <= col + 2*dc < 8):
+                                jumps.append((row+dr,col+dc,row+2*dr,col+2*dc))
+                    jumpTable[(player,isKing,row,col)] = tuple(jumps)
+    return jumpTable
+
+JUMP_TABLE = make_jump_table()
+
+# bitboards store a set of squares as an int, with bit 8*row+column set
+#  for each square in the set (only the dark squares are ever used)
+DARK_SQUARES = sum(1 << (8*row+col) for row in range(8) for col in range(8) if (row+col) % 2 == 1)
+
+def make_bitboard_directions():
+    '''make_bitboard_directions() -> list
+    precomputes the diagonal directions for each player's bitboards
+    for each player, returns a list of (step,right,left,jumpSources,moveSources,forward) where
+      step is the bit offset of one diagonal step (8*rowStep+colStep)
+      (bits >> right) << left moves bit i+step of bits to bit i
+        (one of right/left is step or -step, the other is 0)
+      jumpSources/moveSources are the squares a jump/normal move in the
+        direction stays on the board from
+      forward is True for a forward direction, False if only kings can use it'''
+    bitboardDirections = []
+    for player in range(2):
+        playerDirections = []
+        for dr in (DIRECTION[player],-DIRECTION[player]):
+            for dc in (1,-1):
+                jumpSources = 0
+                moveSources = 0
+                for row in range(8):
+                    for col in range(8):
+                        if (row+col) % 2 == 1 and (0 <= row + 2*dr < 8) and (0 <= col + 2*dc < 8):
+                            jumpSources |= 1 << (8*row+col)
+                        if (row+col) % 2 == 1 and (0 <= row + dr < 8) and (0 <= col + dc < 8):
+                            moveSources |= 1 << (8*row+col)
+                step = 8*dr+dc
+                playerDirections.append((step,max(step,0),max(-step,0),jumpSources,moveSources,\
+                                         dr == DIRECTION[player]))
+        bitboardDirections.append(tuple(playerDirections))
+    return bitboardDirections
+
+BITBOARD_DIRECTIONS = make_bitboard_directions()
+
+def jumpers(mine,theirs,kings,player):
+    '''jumpers(mine,theirs,kings,player) -> int
+    returns the bitboard of player's pieces that can jump
+    mine/theirs are the bitboards of the player's and the opponent's pieces
+    kings is the bitboard of the player's kings'''
+    empty = DARK_SQUARES & ~(mine | theirs)
+    canJump = 0
+    for (step,right,left,jumpSources,moveSources,forward) in BITBOARD_DIRECTIONS[player]:
+        # opponent pieces with an empty square behind them, then the squares before those
+        canJump |= (mine if forward else kings) & jumpSources & \
+                   ((((empty >> right) << left) & theirs) >> right) << left
+    return canJump
+
+def movers(mine,theirs,kings,player):
+    '''movers(mine,theirs,kings,player) -> int
+    returns the bitboard of player's pieces that can make a normal move
+    mine/theirs are the bitboards of the player's and the opponent's pieces
+    kings is the bitboard of the player's kings'''
+    empty = DARK_SQUARES & ~(mine | theirs)
+    canMove = 0
+    for (step,right,left,jumpSources,moveSources,forward) in BITBOARD_DIRECTIONS[player]:
+        canMove |= (mine if forward else kings) & moveSources & ((empty >> right) << left)
+    return canMove
+
+# rows and squares where each player's pieces are crowned
+PROMOTION_ROW = (0,7)
+PROMOTION_SQUARES = tuple(0xff << (8*row) for row in PROMOTION_ROW)
+SEARCH_DEPTH = 6    # number of moves the computer looks ahead
+WIN_SCORE = 1000    # value of a won position, well above any material score
 
-    def no_click(self):
-        '''CheckerSquare.no_click()
-        make the square not respond to clicks'''
-        self.unbind('<Button>')
-        
+# Zobrist keys for hashing positions: ZOBRIST[player][isKing][square] is
+#  XORed in for each piece, and ZOBRIST_TURN[player] for the player to move
+ZOBRIST = [[[random.getrandbits(64) for square in range(64)] for isKing in range(2)] for player in range(2)]
+ZOBRIST_TURN = (0,random.getrandbits(64))
+# kinds of transposition table value: exact, or only a lower/upper bound
+EXACT,LOWER,UPPER = range(3)
+
+def squares_of(bits):
+    '''squares_of(bits) -> generator
+    yields the bit index of each square set in the bitboard'''
+    while bits:
+        lowest = bits & -bits
+        yield lowest.bit_length() - 1
+        bits ^= lowest
+
+def add_jumps(path,mine,theirs,kings,player,change,moveList):
+    '''add_jumps(path,mine,theirs,kings,player,change,moveList)
+    appends to moveList every jump sequence continuing from the end of path
+    change is the Zobrist hash change of the jumps made so far
+    a piece keeps jumping while it can, unless it has just been crowned'''
+    square = path[-1]
+    bit = 1 << square
+    isKing = (kings >> square) & 1
+    empty = DARK_SQUARES & ~(mine | theirs)
+    # look up the player's tables once, outside the loop
+    (keys,theirKeys) = (ZOBRIST[player],ZOBRIST[1-player])
+    promotion = PROMOTION_SQUARES[player]
+    for (step,right,left,jumpSources,moveSources,forward) in BITBOARD_DIRECTIONS[player]:
+        if (forward or isKing) and (bit & jumpSources) and \
+           (theirs >> (square+step)) & 1 and (empty >> (square+2*step)) & 1:
+            jumped = 1 << (square+step)
+            land = 1 << (square+2*step)
+            newMine = mine ^ bit ^ land
+            newTheirs = theirs & ~jumped
+            newKings = kings & ~(jumped | bit)
+            crowned = not isKing and (land & promotion)
+            if isKing or crowned:
+                newKings |= land
+            newPath = path + (square+2*step,)
+            newChange = change ^ keys[isKing][square] ^ \
+                        keys[isKing or bool(crowned)][square+2*step] ^ \
+                        theirKeys[(kings >> (square+step)) & 1][square+step]
+            if not crowned and jumpers(newMine,newTheirs,newMine & newKings,player) & land:
+                # the piece can still jump; it must jump again
+                add_jumps(newPath,newMine,newTheirs,newKings,player,newChange,moveList)
+            else:
+                moveList.append((newPath,newMine,newTheirs,newKings,newChange))
+
+def legal_moves(mine,theirs,kings,player):
+    '''legal_moves(mine,theirs,kings,player) -> list
+    returns the legal moves for player as (path,mine,theirs,kings,change) tuples
+    path is the bit indices of the squares the moving piece visits
+    mine/theirs/kings are the bitboards after the move
+    (kings is the bitboard of both players' kings)
+    change is the value to XOR into the position's Zobrist hash
+    jumps are compulsory, so normal moves are only returned if there are none'''
+    moveList = []
+    canJump = jumpers(mine,theirs,mine & kings,player)
+    if canJump:
+        for square in squares_of(canJump):
+            add_jumps((square,),mine,theirs,kings,player,0,moveList)
+        return moveList
+    empty = DARK_SQUARES & ~(mine | theirs)
+    myKings = mine & kings
+    keys = ZOBRIST[player]
+    promotion = PROMOTION_SQUARES[player]
+    for (step,right,left,jumpSources,moveSources,forward) in BITBOARD_DIRECTIONS[player]:
+        canMove = (mine if forward else myKings) & moveSources & ((empty >> right) << left)
+        while canMove:
+            bit = canMove & -canMove
+            canMove ^= bit
+            square = bit.bit_length() - 1
+            land = 1 << (square+step)
+            isKing = (kings >> square) & 1
+            newKings = kings & ~bit
+            if isKing or (land & promotion):
+                newKings |= land
+            change = keys[isKing][square] ^ keys[(newKings >> (square+step)) & 1][square+step]
+            moveList.append(((square,square+step),mine ^ bit ^ land,theirs,newKings,change))
+    return moveList
+
+def material_score(mine,theirs,kings):
+    '''material_score(mine,theirs,kings) -> int
+    returns the material balance for the owner of mine
+    each piece counts 2, and a king counts 1 more'''
+    return 2 * (mine.bit_count() - theirs.bit_count()) + \
+           (mine & kings).bit_count() - (theirs & kings).bit_count()
+
+def alphabeta(position,player,depth,alpha,beta,maximizing,table):
+    '''alphabeta(position,player,depth,alpha,beta,maximizing,table) -> int
+    returns the minimax value of position for the maximizing player,
+      searching depth moves ahead and pruning outside the alpha-beta window
+    position is (mine,theirs,kings,hash), where mine is the player to move
+    player is the number of the player to move
+    maximizing is True if the maximizing player is to move
+    results are kept in the transposition table dictionary table'''
+    (mine,theirs,kings,positionHash) = position
+    if depth == 0:
+        if maximizing:
+            return material_score(mine,theirs,kings)
+        return material_score(theirs,mine,kings)
+    key = positionHash ^ ZOBRIST_TURN[player]
+    bestPath = None
+    if key in table:
+        (entryDepth,entryValue,flag,bestPath) = table[key]
+        # use the stored value if it was searched deep enough
+        if entryDepth >= depth and (flag == EXACT or \
+           (flag == LOWER and entryValue >= beta) or (flag == UPPER and entryValue <= alpha)):
+            return entryValue
+    moveList = legal_moves(mine,theirs,kings,player)
+    if len(moveList) == 0:
+        if maximizing:
+            return -WIN_SCORE - depth  # lost -- the sooner, the worse
+        return WIN_SCORE + depth  # won -- the sooner, the better
+    # search the stored best move first
+    for index in range(len(moveList)):
+        if moveList[index][0] == bestPath:
+            moveList.insert(0,moveList.pop(index))
+            break
+    (low,high) = (alpha,beta)
+    if maximizing:
+        value = -WIN_SCORE - SEARCH_DEPTH - 1
+        for (path,newMine,newTheirs,newKings,change) in moveList:
+            childValue = alphabeta((newTheirs,newMine,newKings,positionHash ^ change),1-player,\
+                                   depth-1,alpha,beta,False,table)
+            if childValue > value:
+                (value,bestPath) = (childValue,path)
+            alpha = max(alpha,value)
+            if alpha >= beta:
+                break
+    else:
+        value = WIN_SCORE + SEARCH_DEPTH + 1
+        for (path,newMine,newTheirs,newKings,change) in moveList:
+            childValue = alphabeta((newTheirs,newMine,newKings,positionHash ^ change),1-player,\
+                                   depth-1,alpha,beta,True,table)
+            if childValue < value:
+                (value,bestPath) = (childValue,path)
+            beta = min(beta,value)
+            if alpha >= beta:
+                break
+    if value <= low:
+        flag = UPPER
+    elif value >= high:
+        flag = LOWER
+    else:
+        flag = EXACT
+    table[key] = (depth,value,flag,bestPath)
+    return value
 
 class CheckersGame(Frame):
     '''represents a game of checkers'''
@@ -85,47 +258,140 @@ class CheckersGame(Frame):
         super().__init__(master)
         self.grid()
         # set up attributes
-        self.squares = {}  # dictionary to store the square
-        # game colors
-        self.boardColors = ['blanched almond','dark green']
-        self.colors=['red','white']
+        # board state, indexed by [row][column]
+        self.owner = [[-1]*8 for row in range(8)]  # player whose piece is on the square (-1 if empty)
+        self.king = [[0]*8 for row in range(8)]    # 1 if a king is on the square, 0 otherwise
+        self.bb = [0,0]  # bitboards of each player's pieces
+        self.kbb = 0     # bitboard of the kings of both players
+        self.hash = 0    # Zobrist hash of the pieces on the board
+        self.table = {}  # transposition table of the computer's search
+        self.pendingDraw = []       # squares to redraw at the next flush_draw
+        self.drawScheduled = False  # keeps track of whether flush_draw is scheduled
         # set up computer players
         if computerPlayer:
-            self.computerPlayer = self.colors.index(computerPlayer)
+            self.computerPlayer = COLORS.index(computerPlayer)
         else:
             self.computerPlayer = -1
-        self.direction=[-1,1]  # the directions of "forward" motion
         self.turn = 1  # player 0 goes first
         self.pieceSelected = None    # keeps track of whether a piece has been clicked on
         self.jumpInProgress = False  # keeps track of whether a piece is in mid-jump
-        # set up the empty board
+        self.computerMove = []  # squares still to be visited by the computer's move
+        self.canJumpCache = [None,None]  # result of player_can_jump for each player until the board changes
+        # set up the empty board on a single canvas
+        # the light squares are never used, so they are just the canvas background
+        self.board = Canvas(self,width=400,height=400,highlightthickness=0,bd=0,bg=BOARD_COLORS[0])
+        self.board.grid(row=0,column=0,rowspan=8,columnspan=8)
         for row in range(8):
-            for column in range(8):
-                color = self.boardColors[(row+column)%2]
-                self.squares[(row,column)] = CheckerSquare(self,row,column,color)
+            self.columnconfigure(row,minsize=50)  # keep the columns lined up with the board
+            for column in range(1-row%2,8,2):  # only the dark squares
+                self.board.create_rectangle(column*50,row*50,column*50+50,row*50+50,\
+                                            fill=BOARD_COLORS[1],outline=BOARD_COLORS[1],tags='square')
+        # outline for the most recently clicked square (initially hidden)
+        self.board.create_rectangle(0,0,0,0,outline='black',state=HIDDEN,tags='highlight')
+        # only dark squares respond to clicks, which on_click works out from the coordinates
+        self.board.bind('<Button-1>',self.on_click)
         # place the pieces for player 1
         for row in range(3):
             for index in range(4):
-                square = (row,2*index+((row+1)%2))
-                self.squares[square].set_checker(1,self.colors[1],False)
+                (r,c) = (row,2*index+((row+1)%2))
+                self.set_checker(r,c,1,False)
         # place the pieces for player 0
         for row in range(5,8):
             for index in range(4):
-                square = (row,2*index+((row+1)%2))
-                self.squares[square].set_checker(0,self.colors[0],False)
+                (r,c) = (row,2*index+((row+1)%2))
+                self.set_checker(r,c,0,False)
         # set up the display below the board
         self.rowconfigure(8,minsize=3) # leave some space
         Label(self,text='Turn:',font=('Arial',18)).grid(row=9,column=0,columnspan=2,sticky=E)
         # set up indicator for whose turn it is
-        self.turnChecker = CheckerSquare(self,9,2,'lightgray')
-        self.turnChecker.set_checker(0,self.colors[0],False)
-        self.turnChecker.unbind('<Button>')  # don't allow it to be clicked
+        self.turnChecker = Canvas(self,width=50,height=50,highlightthickness=0,bg='lightgray')
+        self.turnChecker.grid(row=9,column=2)  # drawn by next_turn
         # set up message label (initially blank)
         self.message = Label(self,text='',font=('Arial',18))
         self.message.grid(row=9,column=4,columnspan=4)
         # make the first turn
         self.next_turn()
 
+    def _put(self,row,col,player,isKing):
+        '''CheckersGame._put(row,col,player,isKing)
+        places a piece on square (row,col) in the board state only'''
+        self.canJumpCache = [None,None]
+        self.owner[row][col] = player
+        self.king[row][col] = int(isKing)
+        self.bb[player] |= 1 << (8*row+col)
+        if isKing:
+            self.kbb |= 1 << (8*row+col)
+        self.hash ^= ZOBRIST[player][int(isKing)][8*row+col]
+
+    def _take(self,row,col):
+        '''CheckersGame._take(row,col)
+        removes a piece (if any) from square (row,col) in the board state only'''
+        self.canJumpCache = [None,None]
+        if self.owner[row][col] != -1:
+            self.bb[self.owner[row][col]] &= ~(1 << (8*row+col))
+            self.kbb &= ~(1 << (8*row+col))
+            self.hash ^= ZOBRIST[self.owner[row][col]][self.king[row][col]][8*row+col]
+        self.owner[row][col] = -1
+        self.king[row][col] = 0
+
+    def clear_checker(self,row,col):
+        '''CheckersGame.clear_checker(row,col)
+        removes a piece (if any) from square (row,col)
+        the square is redrawn when the event loop is next idle'''
+        self._take(row,col)
+        self.schedule_draw(row,col)
+
+    def set_checker(self,row,col,player,isKing):
+        '''CheckersGame.set_checker(row,col,player,isKing)
+        places a piece on square (row,col)
+        player is the player number
+        isKing is True if the piece is a king, False if a normal piece
+        the square is redrawn when the event loop is next idle'''
+        # clear old checker (if any)
+        self._take(row,col)
+        self._put(row,col,player,isKing)
+        self.schedule_draw(row,col)
+
+    def schedule_draw(self,row,col):
+        '''CheckersGame.schedule_draw(row,col)
+        marks square (row,col) to be redrawn by the next flush_draw'''
+        self.pendingDraw.append((row,col))
+        if not self.drawScheduled:
+            self.drawScheduled = True
+            self.after_idle(self.flush_draw)
+
+    def flush_draw(self):
+        '''CheckersGame.flush_draw()
+        redraws all squares changed since the last flush from the board state
+        the canvas commands are sent to Tcl together as a single script'''
+        board = self.board._w  # Tcl command name of the canvas
+        (owner,king) = (self.owner,self.king)
+        script = []
+        for (row,col) in set(self.pendingDraw):
+            # the canvas items for a piece are tagged with its square
+            tag = 'piece_'+str(row)+'_'+str(col)
+            script.append(board+' delete '+tag)
+            if owner[row][col] == -1:
+                continue
+            # draw new checker
+            (x,y) = (col*50,row*50)
+            script.append('%s create oval %d %d %d %d -fill %s -tags %s' % \
+                          (board,x+8,y+8,x+42,y+42,COLORS[owner[row][col]],tag))
+            # draw king if necessary
+            if king[row][col]:
+                script.append('%s create text %d %d -text * -font {Arial 30} -tags %s' % \
+                              (board,x+25,y+33,tag))
+        if script:
+            self.board.tk.eval('\n'.join(script))
+        self.pendingDraw = []
+        self.drawScheduled = False
+
+    def set_turn_checker(self,player):
+        '''CheckersGame.set_turn_checker(player)
+        shows player's piece on the turn indicator'''
+        self.turnChecker.delete(ALL)
+        self.turnChecker.create_oval(8,8,42,42,fill=COLORS[player])
+
     def on_click(self,event):
         '''CheckersGame.on_click(event)
         event handler for a mouse click
@@ -133,21 +399,27 @@ class CheckersGame(Frame):
           Sets that piece as the piece to be moved
         If clicked on a blank square
           Attempts to move the previously selected piece to the blank square'''
+        if self.turn == self.computerPlayer:
+            return  # the computer is taking its turn
         # get the coordinates of the clicked square and highlight it
-        (row,col) = event.widget.get_pos()
-        event.widget.focus_set()
+        (row,col) = (event.y//50,event.x//50)
+        if not (0 <= row < 8 and 0 <= col < 8) or (row+col) % 2 == 0:
+            return  # only squares whose coords sum to an odd number are used
+        self.board.coords('highlight',col*50,row*50,col*50+49,row*50+49)
+        self.board.itemconfigure('highlight',state=NORMAL)
         # check for click on a current player's piece, not in the middle of a multi-jump move
-        if self.squares[(row,col)].get_player() == self.turn and not self.jumpInProgress:
+        if self.owner[row][col] == self.turn and not self.jumpInProgress:
             # set this square as the piece selected to move
             self.pieceSelected = (row,col)
         # check for click on a blank square if a piece has already been selected to move
-        elif self.pieceSelected and self.squares[(row,col)].is_empty():
+        elif self.pieceSelected and self.owner[row][col] == -1:
             # landing space selected -- check for valid move
             (currentRow,currentCol) = self.pieceSelected
-            isKing = self.squares[(currentRow,currentCol)].is_king() # piece is a king
+            isKing = self.king[currentRow][currentCol] # piece is a king
+            direction = DIRECTION[self.turn]
             # check for a valid normal move (no jump)
-            if ((row - currentRow == self.direction[self.turn]) or \
-                (isKing and row - currentRow == -self.direction[self.turn])) and \
+            if ((row - currentRow == direction) or \
+                (isKing and row - currentRow == -direction)) and \
                abs(col - currentCol) == 1:
                 # not allowed to make a normal move if a jump is possible
                 if self.player_can_jump():
@@ -157,17 +429,17 @@ class CheckersGame(Frame):
                     self.move(currentRow,currentCol,row,col)
                     self.next_turn()
             # check for a valid jump
-            elif ((row - currentRow == (2*self.direction[self.turn])) or \
-                  (isKing and row - currentRow == -(2*self.direction[self.turn]))) and \
+            elif ((row - currentRow == (2*direction)) or \
+                  (isKing and row - currentRow == -(2*direction))) and \
                        abs(col - currentCol) == 2:
                 # check for jumped piece
                 jumpedRow = (row + currentRow) // 2
                 jumpedCol = (col + currentCol) // 2
-                if self.squares[(jumpedRow,jumpedCol)].get_player() == 1 - self.turn:
+                if self.owner[jumpedRow][jumpedCol] == 1 - self.turn:
                     # valid jump
                     # also check that a non-king becomes a king -- this ends the turn
                     self.jump(currentRow,currentCol,row,col)
-                    newKing = self.squares[(row,col)].is_king()
+                    newKing = self.king[row][col]
                     if self.piece_can_jump(row,col) and (isKing or not newKing):
                         # the piece just moved can still jump; must jump again
                         self.jumpInProgress = True
@@ -183,98 +455,46 @@ class CheckersGame(Frame):
             #  instead display a message
             self.message['text'] = 'Must continue jump!'
 
-    def piece_can_jump(self,row,col,getList=False):
-        '''CheckersGame.piece_can_jump(row,col,[getList]) -> bool/list
-        default: returns True if the piece at (row,col) can jump, False if not
-        if getList is True: returns list of squares to move to'''
-        direction = self.direction[self.turn]
-        movetoList = []
-        # forward directions
-        if (0 <= row + 2*direction < 8) and (0 <= col + 2 < 8) and \
-           (self.squares[(row+direction,col+1)].get_player() == 1 - self.turn) and \
-           (self.squares[(row+2*direction,col+2)].is_empty()):
-            movetoList.append((row+2*direction,col+2))
-        if (0 <= row + 2*direction < 8) and (0 <= col - 2 < 8) and \
-           (self.squares[(row+direction,col-1)].get_player() == 1 - self.turn) and \
-           (self.squares[(row+2*direction,col-2)].is_empty()):
-            movetoList.append((row+2*direction,col-2))
-        # backwards directions -- only check if the piece is a king
-        if self.squares[(row,col)].is_king():
-            if (0 <= row - 2*direction < 8) and (0 <= col + 2 < 8) and \
-            (self.squares[(row-direction,col+1)].get_player() == 1 - self.turn) and \
-            (self.squares[(row-2*direction,col+2)].is_empty()):
-                movetoList.append((row-2*direction,col+2))
-            if (0 <= row - 2*direction < 8) and (0 <= col - 2 < 8) and \
-             (self.squares[(row-direction,col-1)].get_player() == 1 - self.turn) and \
-             (self.squares[(row-2*direction,col-2)].is_empty()):
-                movetoList.append((row-2*direction,col-2))
-        if getList:
-            return movetoList
-        else:
-            return len(movetoList) > 0
-
-    def player_can_jump(self):
-        '''CheckersGame.player_can_jump() -> bool
-        returns True if any of the player's pieces can jump, False if not'''
-        # loop over the board, only looking at the dark squares
-        for row in range(8):
-            for column in range(8):
-                if (row+column) % 2 == 1 and \
-                   self.squares[(row,column)].get_player() == self.turn and \
-                   self.piece_can_jump(row,column):
-                    # found a player's piece that can jump, so return True
-                    return True
+    def piece_can_jump(self,row,col):
+        '''CheckersGame.piece_can_jump(row,col) -> bool
+        returns True if the piece at (row,col) can jump, False if not'''
+        owner = self.owner
+        opponent = 1 - self.turn
+        for (jumpr,jumpc,landr,landc) in JUMP_TABLE[(self.turn,self.king[row][col],row,col)]:
+            if owner[jumpr][jumpc] == opponent and owner[landr][landc] == -1:
+                return True
         return False
 
-    def piece_can_move(self,row,col,getList=False):
-        '''CheckersGame.piece_can_move(row,col[,getList]) -> bool
-        default: returns True if the piece at (row,col) can make a normal move, False if not
-        if getList is True: returns list of squares to move to'''
-        direction = self.direction[self.turn]
-        movetoList = []
-        # forward directions
-        if (0 <= row + direction < 8) and (0 <= col + 1 < 8) and \
-           (self.squares[(row+direction,col+1)].is_empty()):
-            movetoList.append((row+direction,col+1))
-        if (0 <= row + direction < 8) and (0 <= col - 1 < 8) and \
-           (self.squares[(row+direction,col-1)].is_empty()):
-            movetoList.append((row+direction,col-1))
-        # backwards directions -- only check if the piece is a king
-        if self.squares[(row,col)].is_king():
-            if (0 <= row - direction < 8) and (0 <= col + 1 < 8) and \
-            (self.squares[(row-direction,col+1)].is_empty()):
-                movetoList.append((row-direction,col+1))
-            if (0 <= row - direction < 8) and (0 <= col - 1 < 8) and \
-             (self.squares[(row-direction,col-1)].is_empty()):
-                movetoList.append((row-direction,col-1))
-        if getList:
-            return movetoList
-        else:
-            return len(movetoList) > 0
+    def player_can_jump(self,player=None):
+        '''CheckersGame.player_can_jump([player]) -> bool
+        returns True if any of player's pieces can jump, False if not
+        player defaults to the player whose turn it is'''
+        if player is None:
+            player = self.turn
+        if self.canJumpCache[player] is None:
+            mine = self.bb[player]
+            self.canJumpCache[player] = jumpers(mine,self.bb[1-player],mine & self.kbb,player) != 0
+        return self.canJumpCache[player]
 
-    def player_can_move(self):
-        '''CheckersGame.player_can_move() -> bool
-        returns True if any of the player's pieces can make a normal move, False if not'''
-        # loop over the board, only looking at the dark squares
-        for row in range(8):
-            for column in range(8):
-                if (row+column) % 2 == 1 and \
-                   self.squares[(row,column)].get_player() == self.turn and \
-                   self.piece_can_move(row,column):
-                    # found a player's piece that can move, so return True
-                    return True
-        return False
+    def player_can_move(self,player=None):
+        '''CheckersGame.player_can_move([player]) -> bool
+        returns True if any of player's pieces can make a normal move, False if not
+        player defaults to the player whose turn it is'''
+        if player is None:
+            player = self.turn
+        mine = self.bb[player]
+        return movers(mine,self.bb[1-player],mine & self.kbb,player) != 0
 
     def move(self,oldr,oldc,newr,newc):
         '''CheckersGame.move(oldr,oldc,newr,newc)
         moves the piece that's on square (oldr,oldc) to square (newr,newc)'''
         # check if the piece is a king
-        isKing = self.squares[(oldr,oldc)].is_king()
-        if newr == 7 * self.turn:  # made to last row, make it a king
+        isKing = self.king[oldr][oldc]
+        if newr == PROMOTION_ROW[self.turn]:  # made to last row, make it a king
             isKing = True
         # erase the piece from the old square, and place it in the new square
-        self.squares[(oldr,oldc)].clear_checker()
-        self.squares[(newr,newc)].set_checker(self.turn,self.colors[self.turn],isKing)
+        self.clear_checker(oldr,oldc)
+        self.set_checker(newr,newc,self.turn,isKing)
 
     def jump(self,oldr,oldc,newr,newc):
         '''CheckersGame.jump(oldr,oldc,newr,newc)
@@ -285,143 +505,117 @@ class CheckersGame(Frame):
         # remove jumped piece
         jumpr = (oldr + newr) // 2
         jumpc = (oldc + newc) // 2
-        self.squares[(jumpr,jumpc)].clear_checker()
+        self.clear_checker(jumpr,jumpc)
 
     def next_turn(self):
         '''CheckersGame.next_turn()
         goes to the other player's turn
         if that player can't move, the game is over and the previous player wins'''
-        # switch to other player and update the status indicators
-        self.turn = 1 - self.turn
-        self.turnChecker.set_checker(self.turn,self.colors[self.turn],False)
-        self.message['text'] = ''
         # reset the status attributes
+        self.message['text'] = ''
         self.pieceSelected = None
         self.jumpInProgress = False
-        # check for a legal move
-        if not self.player_can_move() and not self.player_can_jump():
-            # no legal move, so the game is over
-            self.turn = 1 - self.turn   # previous player won
-            self.turnChecker.set_checker(self.turn,self.colors[self.turn],False)
-            self.message['text'] = self.colors[self.turn].title()+' wins!'
-            # unbind all squares so winning player can't move anymore
-            for square in self.squares.values():
-                square.no_click()
-            self.turnChecker.clear_checker()
-        elif self.computerPlayer == self.turn:
+        # check the other player for a legal move before switching to them
+        #  (this leaves their jump check cached for on_click)
+        nextTurn = 1 - self.turn
+        if not self.player_can_jump(nextTurn) and not self.player_can_move(nextTurn):
+            # no legal move, so the game is over and the current player won
+            self.message['text'] = COLORS[self.turn].title()+' wins!'
+            # unbind the board so winning player can't move anymore
+            self.board.unbind('<Button-1>')
+            self.turnChecker.delete(ALL)
+            return
+        # switch to other player and update the status indicator
+        self.turn = nextTurn
+        self.set_turn_checker(self.turn)
+        if self.computerPlayer == self.turn:
             self.after(1000,self.take_computer_turn_smarter)
 
-    def creates_jump(self,r,c,nr,nc):
-        '''CheckersGame.create_jump(r,c,nr,nc) -> bool
-        determines if moving from (r,c) to (nr,nc) creates a jump for the other player
-        returns True if it does, False others
-        Note: actually temporarily moves pieces on the board, but happens to fast that
-          it's not noticeable to the naked eye'''
-        newJump = False
-        # temporarily look at other player
-        self.turn = 1 - self.turn
-        if self.player_can_jump(): # player could jump already
-            self.turn = 1 - self.turn
-            return False
-        # move the piece, see if a new jump is created
-        self.turn = 1 - self.turn
-        self.move(r,c,nr,nc)
-        self.turn = 1 - self.turn
-        if self.player_can_jump(): # player can now jump
-            newJump = True
-        # undo the move
-        self.turn = 1 - self.turn
-        self.move(nr,nc,r,c)
-        return newJump
-
-    def jumpable_pieces(self,oldrow=None,oldcol=None,newrow=None,newcol=None):
-        '''CheckersGame.jumpable_pieces() -> int
-        returns number of opponent's pieces that can jump'''
-        if oldrow:
-            self.move(oldrow,oldcol,newrow,newcol)
-        # temporarily look at other player
-        self.turn = 1 - self.turn
-        numPieces = 0
-        for row in range(8):
-            for col in range(8):
-                # count pieces that can jump
-                if self.squares[(row,col)].get_player() == self.turn and self.piece_can_jump(row,col):
-                    numPieces += 1
-        self.turn = 1 - self.turn
-        if oldrow:
-            self.move(newrow,newcol,oldrow,oldcol)
-        return numPieces
-
+    def find_best_move(self):
+        '''CheckersGame.find_best_move() -> list
+        returns the squares visited by the current player's best move
+        searches with iterative deepening up to SEARCH_DEPTH moves ahead,
+          trying the best move of each depth first at the next depth
+        ties between equally good moves are broken uniformly at random'''
+        self.table = {}
+        moveList = legal_moves(self.bb[self.turn],self.bb[1-self.turn],self.kbb,self.turn)
+        bestMove = moveList[0]
+        if len(moveList) > 1:
+            for depth in range(1,SEARCH_DEPTH+1):
+                bestValue = -WIN_SCORE - SEARCH_DEPTH - 1
+                numBest = 0  # number of moves found so far worth bestValue
+                # on the last pass the window starts just below bestValue,
+                #  so that a tied move gets its exact value
+                tieMargin = 1 if depth == SEARCH_DEPTH else 0
+                for move in moveList:
+                    (path,newMine,newTheirs,newKings,change) = move
+                    value = alphabeta((newTheirs,newMine,newKings,self.hash ^ change),1-self.turn,depth-1,\
+                                      bestValue - tieMargin,WIN_SCORE + SEARCH_DEPTH + 1,False,self.table)
+                    if value > bestValue:
+                        (bestMove,bestValue,numBest) = (move,value,1)
+                    elif value == bestValue and tieMargin:
+                        # keep each tied move with probability 1/numBest (reservoir sampling)
+                        numBest += 1
+                        if random.randrange(numBest) == 0:
+                            bestMove = move
+                moveList.remove(bestMove)
+                moveList.insert(0,bestMove)
+        return [divmod(square,8) for square in bestMove[0]]
 
     def take_computer_turn_smarter(self):
         '''CheckersGame.take_computer_turn_smarter()
-        plays the computer's turn using a smart AI'''
-        if self.player_can_jump():
-            # must jump a piece
-            if not self.jumpInProgress:
-                # collect possible moves
-                moveList = []
-                for row in range(8):
-                    for col in range(8):
-                        if self.squares[(row,col)].get_player() == self.turn:
-                            for (newrow,newcol) in self.piece_can_jump(row,col,True):
-                                moveList.append((row,col,newrow,newcol))
-                # tries to make a king if possiblw
-                kingMeList = [(r,c,nr,nc) for (r,c,nr,nc) in moveList if not self.squares[(r,c)].is_king() and r+2*self.direction[self.turn] in [0,7]]
-                if len(kingMeList) > 0:
-                    (row,col,newrow,newcol) = random.choice(kingMeList)
-                else:
-                    (row,col,newrow,newcol) = random.choice(moveList)
-            else:
-                (row,col) = self.pieceSelected
-                (newrow,newcol) = random.choice(self.piece_can_jump(row,col,True))
-            isKing = self.squares[(row,col)].is_king()
+        plays the computer's turn using alpha-beta search
+        the search runs in a background thread so the window keeps responding'''
+        result = queue.Queue()
+        threading.Thread(target=self.search_for_move,args=(result,),daemon=True).start()
+        self.wait_for_computer_move(result)
+
+    def search_for_move(self,result):
+        '''CheckersGame.search_for_move(result)
+        runs in the background thread: puts the computer's move in result,
+          or the exception if the search fails'''
+        try:
+            result.put(self.find_best_move())
+        except Exception as error:
+            result.put(error)
+
+    def wait_for_computer_move(self,result):
+        '''CheckersGame.wait_for_computer_move(result)
+        checks every 50ms for the search to put the computer's move in result,
+          then starts playing it
+        an exception from the search is re-raised here, on the Tk thread'''
+        try:
+            move = result.get_nowait()
+        except queue.Empty:
+            self.after(50,self.wait_for_computer_move,result)
+            return
+        if isinstance(move,Exception):
+            self.message['text'] = 'Computer error!'
+            raise move
+        self.computerMove = move
+        self.play_computer_move()
+
+    def play_computer_move(self):
+        '''CheckersGame.play_computer_move()
+        plays the next step of the computer's move in self.computerMove
+        a multi-jump is played one jump at a time'''
+        (row,col) = self.computerMove.pop(0)
+        (newrow,newcol) = self.computerMove[0]
+        if abs(newrow - row) == 1:
+            # make the move and go to next player
+            self.move(row,col,newrow,newcol)
+            self.next_turn()
+        else:
             # make the jump
             self.jump(row,col,newrow,newcol)
-            newKing = self.squares[(newrow,newcol)].is_king()
-            if self.piece_can_jump(newrow,newcol) and (isKing or not newKing):
+            if len(self.computerMove) > 1:
                 # must jump again
                 self.jumpInProgress = True
                 self.pieceSelected = (newrow,newcol)
-                self.after(500,self.take_computer_turn_smarter)
+                self.after(500,self.play_computer_move)
             else: # turn over, go to next player
                 self.next_turn()
-        else: # must make a normal move
-            #jumpablePieces = self.jumpable_pieces()
-            moveList = []
-            bestMoveList = []
-            bestMoveValue = 99
-            kingMeList = []
-            for row in range(8):
-                for col in range(8):
-                    if self.squares[(row,col)].get_player() == self.turn:
-                        for (newrow,newcol) in self.piece_can_move(row,col,True):
-                            moveList.append((row,col,newrow,newcol))
-                            if self.squares[(row,col)].is_king() or row+self.direction[self.turn] not in [0,7]:
-                                # determine if the number of opponents' pieces
-                                #  has gone down
-                                moveValue = self.jumpable_pieces(row,col,newrow,newcol)
-                                if moveValue < bestMoveValue:
-                                    bestMoveList = [(row,col,newrow,newcol)]
-                                    bestMoveValue = moveValue
-                                elif moveValue == bestMoveValue:
-                                    bestMoveList.append((row,col,newrow,newcol))
-                            else:
-                                kingMeList.append((row,col,newrow,newcol))
-            endPiecesList = [(r,c,nr,nc) for (r,c,nr,nc) in moveList if not self.squares[(r,c)].is_king() \
-                             and r in [0,7]]
-            goodMoveList = [move for move in bestMoveList if move not in endPiecesList]
-            if len(kingMeList) > 0:
-                (row,col,newrow,newcol) = random.choice(kingMeList)
-            elif len(goodMoveList) > 0:
-                (row,col,newrow,newcol) = random.choice(goodMoveList)
-            else:
-                (row,col,newrow,newcol) = random.choice(bestMoveList)
-            # make the move and go to next player
-            self.move(row,col,newrow,newcol)
-            self.next_turn()
 
-       
 def get_game_type():
     '''get_game_type() -> str or None
     gets input for type of game'''